@@ -11,16 +11,24 @@ This module provides a modernized, production-ready banking client that demonstr
 - Clean architecture with separation of concerns
 """
 
+import asyncio
 import json
 import logging
 import os
+import queue
 import sys
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 from urllib3.util.retry import Retry
 
 # Configure logging
@@ -30,6 +38,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_CENT = Decimal("0.01")
+
+
+def _to_cents(amount: float) -> Decimal:
+    """Round an amount to whole cents, half-up (2.675 -> 2.68)."""
+    return Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
 
 @dataclass
 class TransferRequest:
@@ -46,6 +61,8 @@ class TransferRequest:
             raise ValueError("to_account must be a non-empty string")
         if self.amount <= 0:
             raise ValueError("amount must be greater than 0")
+        if _to_cents(self.amount) < _CENT:
+            raise ValueError("amount must be at least 0.01")
         if self.from_account == self.to_account:
             raise ValueError("from_account and to_account cannot be the same")
 
@@ -54,7 +71,7 @@ class TransferRequest:
         return {
             "fromAccount": self.from_account,
             "toAccount": self.to_account,
-            "amount": round(self.amount, 2)
+            "amount": float(_to_cents(self.amount))
         }
 
 
@@ -81,6 +98,153 @@ class TransferResponse:
         )
 
 
+@dataclass
+class NettingResult:
+    """
+    Outcome of netting a batch of transfers.
+
+    Attributes:
+        transfers: Netted transfers with the same net effect as the batch
+        sources: For each netted transfer, indices of the original items
+            on the same account pair (either direction)
+        offsets: For each netted transfer, indices of original items on
+            other account pairs that were cancelled against it in a cycle
+        cancelled: Indices of original items on account pairs that need no
+            transfer; items consumed by a cycle also appear in the offsets
+            of the transfers they reduced
+        cycles: Each cancelled cycle as (indices of the items on its account
+            pairs, amount taken off every leg)
+    """
+    transfers: List[TransferRequest] = field(default_factory=list)
+    sources: List[List[int]] = field(default_factory=list)
+    offsets: List[List[int]] = field(default_factory=list)
+    cancelled: List[int] = field(default_factory=list)
+    cycles: List[Tuple[List[int], float]] = field(default_factory=list)
+
+
+@dataclass
+class BatchTransferResult:
+    """Data class for the outcome of a batch submission."""
+    responses: List[TransferResponse] = field(default_factory=list)
+    netting: Optional[NettingResult] = None
+
+
+@dataclass
+class BalanceChange:
+    """Data class for a balance change delivered by watch_balances()."""
+    account_id: str
+    balance: Any
+    previous: Any = None
+
+
+def _find_cycle(
+    edges: Dict[Tuple[str, str], Decimal]
+) -> Optional[List[Tuple[str, str]]]:
+    """Return the edges of one directed cycle in the flow graph, if any."""
+    graph: Dict[str, List[str]] = {}
+    for src, dst in edges:
+        graph.setdefault(src, []).append(dst)
+
+    state: Dict[str, int] = {}  # 1 = on DFS stack, 2 = done
+    for root in graph:
+        if root in state:
+            continue
+        path = [root]
+        iters = [iter(graph.get(root, []))]
+        state[root] = 1
+        while iters:
+            node = next(iters[-1], None)
+            if node is None:
+                state[path.pop()] = 2
+                iters.pop()
+            elif state.get(node) == 1:
+                cycle = path[path.index(node):] + [node]
+                return list(zip(cycle, cycle[1:]))
+            elif node not in state:
+                state[node] = 1
+                path.append(node)
+                iters.append(iter(graph.get(node, [])))
+    return None
+
+
+def net_transfers(transfers: List[TransferRequest]) -> NettingResult:
+    """
+    Compress a batch of transfers into fewer requests with the same net effect.
+
+    Flows are first aggregated per account pair (A->B and B->A offset each
+    other), then cycles such as A->B, B->C, C->A are greedily cancelled by
+    their smallest leg. The result has no cycles but is not guaranteed to
+    be the minimum possible number of transfers. Remaining transfers only
+    use account pairs present in the input, so every netted transfer can be
+    traced back to original items.
+
+    Args:
+        transfers: Original transfer requests, in submission order
+
+    Returns:
+        NettingResult with the netted transfers and the audit mapping
+    """
+    flows: Dict[Tuple[str, str], Decimal] = {}
+    pair_items: Dict[Tuple[str, str], List[int]] = {}
+    for index, item in enumerate(transfers):
+        src, dst = item.from_account, item.to_account
+        pair = (src, dst) if src < dst else (dst, src)
+        pair_items.setdefault(pair, []).append(index)
+        # Net amount is stored in the pair's canonical direction
+        sign = 1 if pair == (src, dst) else -1
+        flows[pair] = flows.get(pair, Decimal(0)) + sign * _to_cents(item.amount)
+
+    edges: Dict[Tuple[str, str], Decimal] = {}
+    for (a, b), amount in flows.items():
+        if amount > 0:
+            edges[(a, b)] = amount
+        elif amount < 0:
+            edges[(b, a)] = -amount
+
+    result = NettingResult()
+    # Pairs sharing a cancelled cycle with each pair (direct only)
+    linked: Dict[Tuple[str, str], set] = {}
+    cycle = _find_cycle(edges)
+    while cycle:
+        smallest = min(edges[edge] for edge in cycle)
+        pairs = [tuple(sorted(edge)) for edge in cycle]
+        for pair in pairs:
+            linked.setdefault(pair, set()).update(pairs)
+        result.cycles.append((
+            sorted(index for pair in pairs for index in pair_items[pair]),
+            float(smallest)
+        ))
+        for edge in cycle:
+            edges[edge] -= smallest
+            if edges[edge] == 0:
+                del edges[edge]
+        cycle = _find_cycle(edges)
+
+    for pair, indices in pair_items.items():
+        a, b = pair
+        edge = (a, b) if (a, b) in edges else (b, a)
+        if edge not in edges:
+            result.cancelled.extend(indices)
+            continue
+        result.transfers.append(TransferRequest(
+            from_account=edge[0],
+            to_account=edge[1],
+            amount=float(edges[edge])
+        ))
+        result.sources.append(indices)
+        result.offsets.append(sorted(
+            index
+            for other in linked.get(pair, set()) if other != pair
+            for index in pair_items[other]
+        ))
+    result.cancelled.sort()
+
+    logger.info(
+        f"Netted {len(transfers)} transfers into {len(result.transfers)}"
+    )
+    return result
+
+
 class BankingAPIError(Exception):
     """Base exception for banking API errors."""
     pass
@@ -96,6 +260,368 @@ class TransferError(BankingAPIError):
     pass
 
 
+class BatchTransferError(TransferError):
+    """
+    Raised when a transfer in a batch fails.
+
+    The partial BatchTransferResult (responses of transfers already applied
+    and any netting audit) is kept in ``result``; the original error is the
+    exception's ``__cause__``.
+    """
+
+    def __init__(self, message: str, result: 'BatchTransferResult'):
+        super().__init__(message)
+        self.result = result
+
+
+class QueueFullError(BankingAPIError):
+    """Raised when a submission queue has no capacity and the caller won't wait."""
+    pass
+
+
+class _TransportError(BankingAPIError):
+    """Raised internally when an endpoint cannot be reached; triggers failover."""
+
+    def __init__(self, message: str, sent: bool = True):
+        super().__init__(message)
+        # False when no connection was made, so the server never saw the request
+        self.sent = sent
+
+
+def _is_connect_failure(error: requests.exceptions.RequestException) -> bool:
+    """Check whether a requests error happened before the request was sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+BALANCING_STRATEGIES = ("least_outstanding", "ewma")
+
+# Connections kept per endpoint
+POOL_MAXSIZE = 10
+
+# Read latencies kept for the hedge delay, and how many are needed first
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+# Most hedges that can be sent back to back, however long reads were healthy
+HEDGE_MAX_TOKENS = 5.0
+
+
+class Endpoint:
+    """
+    One banking API replica with its own connection pool and health state.
+
+    Attributes:
+        url: Base URL of the replica
+        session: Session owning this replica's connection pool
+        outstanding: Number of requests currently in flight
+        ewma_latency: Peak EWMA of request latency (seconds)
+        consecutive_failures: Failures since the last success
+        ejected: Whether the replica is out of rotation
+        ejected_until: Monotonic time after which an ejected replica is probed
+        probing: Whether a re-admission probe is in flight
+    """
+
+    EWMA_ALPHA = 0.3
+    # Idle replicas' latency estimate halves every this many seconds, so a
+    # replica penalised in the past is eventually tried again
+    DECAY_HALF_LIFE = 10.0
+
+    def __init__(self, url: str, session: requests.Session):
+        self.url = url
+        self.session = session
+        self.outstanding = 0
+        self.ewma_latency = 0.0
+        self.consecutive_failures = 0
+        self.ejected = False
+        self.ejected_until = 0.0
+        self.probing = False
+        self._updated = time.monotonic()
+
+    def cost(self, now: Optional[float] = None) -> float:
+        """Latency estimate, decayed for the time since the last sample."""
+        now = time.monotonic() if now is None else now
+        return self.ewma_latency * 0.5 ** ((now - self._updated) / self.DECAY_HALF_LIFE)
+
+    def record_latency(self, latency: float) -> None:
+        """
+        Fold a latency sample into the peak EWMA.
+
+        Samples above the current estimate replace it outright, so a replica
+        that slows down is penalised immediately; lower samples only pull
+        the estimate down gradually.
+        """
+        now = time.monotonic()
+        current = self.cost(now)
+        if latency >= current:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = current + self.EWMA_ALPHA * (latency - current)
+        self._updated = now
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and return the replica to rotation."""
+        self.record_latency(latency)
+        self.consecutive_failures = 0
+        self.ejected = False
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r}, outstanding={self.outstanding})"
+
+
+class BalanceWatcher:
+    """
+    Delivers balance changes for a set of accounts.
+
+    The server has no push endpoint, so changes are detected by an adaptive
+    poller on a background thread. Each poll fetches all balances with a
+    single GET /accounts where the listing includes balances, falling back
+    to one GET /accounts/balance/{id} per account otherwise. The interval
+    doubles after every poll without changes (up to max_interval) and
+    resets to min_interval when something changes, so steady-state request
+    volume follows the change rate rather than the number of accounts.
+
+    Changes are passed to the callback and can also be consumed with
+    ``for change in watcher`` or ``async for change in watcher``. Each
+    iterator starts with the current balances, then receives changes
+    through its own queue of at most max_queued items, and ends when the
+    watcher stops.
+    """
+
+    def __init__(
+        self,
+        client: 'BankingClient',
+        account_ids: Iterable[str],
+        callback: Optional[Callable[[BalanceChange], None]] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        max_queued: int = 1000
+    ):
+        self.account_ids = list(dict.fromkeys(account_ids))
+        if not self.account_ids:
+            raise ValueError("account_ids cannot be empty")
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+
+        self.client = client
+        self.callback = callback
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.polls = 0
+        # Latest error per account whose balance could not be fetched
+        self.errors: Dict[str, str] = {}
+        self._balances: Dict[str, Any] = {}
+        self._batched: Optional[bool] = None
+        self._max_queued = max_queued
+        self._subscribers: List[Callable[[Optional[BalanceChange]], None]] = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="banking-balance-watcher", daemon=True
+        )
+
+    def start(self) -> 'BalanceWatcher':
+        """Start polling in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling and end any iteration in progress."""
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._close()
+
+    def __enter__(self) -> 'BalanceWatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _close(self) -> None:
+        """Send the end-of-stream marker (None) to every iterator."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            subscribers, self._subscribers = self._subscribers, []
+        for deliver in subscribers:
+            deliver(None)
+
+    def _subscribe(self, deliver: Callable[[Optional[BalanceChange]], None]) -> None:
+        """Register an iterator, replaying the current balances to it first."""
+        with self._lock:
+            for account_id, balance in self._balances.items():
+                deliver(BalanceChange(account_id, balance))
+            if self._closed:
+                deliver(None)
+            else:
+                self._subscribers.append(deliver)
+
+    def _unsubscribe(self, deliver: Callable[[Optional[BalanceChange]], None]) -> None:
+        with self._lock:
+            if deliver in self._subscribers:
+                self._subscribers.remove(deliver)
+
+    def _offer(self, changes: Any, change: Optional[BalanceChange], full: type, empty: type) -> None:
+        """Non-blocking put into a bounded queue.Queue or asyncio.Queue."""
+        while True:
+            try:
+                changes.put_nowait(change)
+                return
+            except full:
+                if change is not None:
+                    logger.warning(f"Dropping balance change for {change.account_id}: queue full")
+                    return
+            # Make room so the end-of-stream marker always lands
+            try:
+                changes.get_nowait()
+            except empty:
+                pass
+
+    def __iter__(self):
+        changes: queue.Queue = queue.Queue(maxsize=self._max_queued)
+
+        def deliver(change):
+            self._offer(changes, change, queue.Full, queue.Empty)
+
+        self._subscribe(deliver)
+        try:
+            while True:
+                change = changes.get()
+                if change is None:
+                    return
+                yield change
+        finally:
+            self._unsubscribe(deliver)
+
+    async def __aiter__(self):
+        changes: asyncio.Queue = asyncio.Queue(maxsize=self._max_queued)
+        loop = asyncio.get_running_loop()
+
+        def deliver(change):
+            try:
+                loop.call_soon_threadsafe(
+                    self._offer, changes, change, asyncio.QueueFull, asyncio.QueueEmpty
+                )
+            except RuntimeError:
+                # Event loop already closed; nobody is listening any more
+                pass
+
+        self._subscribe(deliver)
+        try:
+            while True:
+                change = await changes.get()
+                if change is None:
+                    return
+                yield change
+        finally:
+            self._unsubscribe(deliver)
+
+    def _fetch_balances(self) -> Dict[str, Any]:
+        """
+        Fetch current balances, batched into one request when possible.
+
+        Accounts absent from the listing are fetched individually. An account
+        whose fetch fails is left out of this poll and recorded in ``errors``
+        rather than failing the poll for every other account.
+        """
+        balances = {}
+        missing = self.account_ids
+        if self._batched is not False:
+            listed = _extract_balances(self.client.list_accounts())
+            if listed:
+                self._batched = True
+                balances = {
+                    account_id: listed[account_id]
+                    for account_id in self.account_ids if account_id in listed
+                }
+                missing = [a for a in self.account_ids if a not in listed]
+            else:
+                logger.info("Account listing has no balances; polling accounts individually")
+                self._batched = False
+
+        for account_id in missing:
+            try:
+                response = self.client.get_account_balance(account_id)
+            except BankingAPIError as e:
+                if account_id not in self.errors:
+                    logger.warning(f"Cannot fetch balance for {account_id}: {str(e)}")
+                self.errors[account_id] = str(e)
+                continue
+            self.errors.pop(account_id, None)
+            balances[account_id] = response.get("balance", response)
+        return balances
+
+    def poll(self) -> List[BalanceChange]:
+        """
+        Poll once and deliver balances that changed since the last poll.
+
+        Returns:
+            List of changes delivered by this poll
+        """
+        self.polls += 1
+        balances = self._fetch_balances()
+        with self._lock:
+            changes = [
+                BalanceChange(account_id, balance, self._balances.get(account_id))
+                for account_id, balance in balances.items()
+                if account_id not in self._balances or self._balances[account_id] != balance
+            ]
+            self._balances.update(balances)
+            for change in changes:
+                for deliver in self._subscribers:
+                    deliver(change)
+
+        for change in changes:
+            if self.callback is not None:
+                try:
+                    self.callback(change)
+                except Exception:
+                    logger.exception("Balance watch callback failed")
+
+        self.interval = (
+            self.min_interval if changes else min(self.interval * 2, self.max_interval)
+        )
+        return changes
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll()
+                except BankingAPIError as e:
+                    logger.warning(f"Balance poll failed: {str(e)}")
+                    self.interval = min(self.interval * 2, self.max_interval)
+                except Exception:
+                    logger.exception("Unexpected error while polling balances")
+                    self.interval = min(self.interval * 2, self.max_interval)
+                self._stop.wait(self.interval)
+        finally:
+            # Iterators must never outlive the poller
+            self._close()
+
+
+def _extract_balances(payload: Any) -> Dict[str, Any]:
+    """Map account ID to balance from an account listing, where present."""
+    if isinstance(payload, dict):
+        payload = payload.get("accounts", [])
+    balances = {}
+    if isinstance(payload, list):
+        for account in payload:
+            if not isinstance(account, dict) or "balance" not in account:
+                continue
+            account_id = account.get("id") or account.get("accountId") or account.get("accountNumber")
+            if account_id:
+                balances[account_id] = account["balance"]
+    return balances
+
+
 class BankingClient:
     """
     Modern banking client with JWT authentication and comprehensive error handling.
@@ -113,38 +639,252 @@ class BankingClient:
 
     def __init__(
         self,
-        base_url: Optional[str] = None,
+        base_url: Optional[Union[str, List[str]]] = None,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        balancing: str = "least_outstanding",
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        health_check_interval: Optional[float] = None,
+        hedge_reads: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_budget: float = 0.05
     ):
         """
         Initialize the banking client.
         
         Args:
-            base_url: Base URL for the banking API (defaults to env var or localhost:8123)
+            base_url: Base URL, or list of replica base URLs, for the banking API
+                (defaults to env var, comma-separated, or localhost:8123)
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
+            balancing: Replica selection strategy ('least_outstanding' or 'ewma')
+            eject_after: Consecutive failures before a replica is ejected
+            eject_seconds: How long an ejected replica is skipped before
+                it is probed for re-admission
+            health_check_interval: If set, probe every replica in the
+                background this often (seconds)
+            hedge_reads: Send a duplicate GET when the first one is slow
+            hedge_percentile: Read latency percentile after which to hedge
+            hedge_budget: Hedges earned per read (token bucket capped at
+                HEDGE_MAX_TOKENS), i.e. the long-run fraction of reads hedged
         """
-        self.base_url = base_url or os.getenv("BANKING_API_URL", "http://localhost:8123")
+        if balancing not in BALANCING_STRATEGIES:
+            raise ValueError(
+                f"balancing must be one of {', '.join(BALANCING_STRATEGIES)}"
+            )
+        if not 0 < hedge_percentile <= 1:
+            raise ValueError("hedge_percentile must satisfy 0 < hedge_percentile <= 1")
+        if not 0 <= hedge_budget <= 1:
+            raise ValueError("hedge_budget must satisfy 0 <= hedge_budget <= 1")
+
+        urls = base_url or os.getenv("BANKING_API_URL", "http://localhost:8123")
+        if isinstance(urls, str):
+            urls = [url.strip() for url in urls.split(",") if url.strip()]
+        if not urls:
+            raise ValueError("at least one base_url is required")
+
+        self.base_url = urls[0]
         self.timeout = timeout
+        self.balancing = balancing
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
         self._token: Optional[str] = None
         self._token_claim: Optional[str] = None
 
-        # Create session with connection pooling and retry strategy
-        self.session = requests.Session()
+        # Each replica gets its own session and connection pool
+        self.endpoints = [
+            Endpoint(url, self._create_session(max_retries, failover=len(urls) > 1))
+            for url in urls
+        ]
+        self._endpoint_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        if health_check_interval:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                args=(health_check_interval,),
+                name="banking-health-check",
+                daemon=True
+            )
+            self._health_thread.start()
+
+        # Request hedging for idempotent reads
+        self.hedge_reads = hedge_reads
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self._read_latencies: deque = deque(maxlen=HEDGE_WINDOW)
+        self._hedge_tokens = 0.0
+        self._hedges = 0
+        self._hedge_lock = threading.Lock()
+        # Hedgeable reads and their hedges run on two reusable pools, one
+        # worker per pooled connection each. When a pool is busy the work is
+        # not queued: the read runs unhedged on the caller's thread, or the
+        # hedge is skipped.
+        self._pool_workers = POOL_MAXSIZE * len(self.endpoints)
+        self._pool_slots = {
+            kind: threading.BoundedSemaphore(self._pool_workers) for kind in ("read", "hedge")
+        }
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+
+        logger.info(f"Initialized BankingClient with base URL(s): {', '.join(urls)}")
+
+    @staticmethod
+    def _create_session(max_retries: int, failover: bool = False) -> requests.Session:
+        """
+        Create a session with connection pooling and retry strategy.
+
+        With failover (several replicas), connection and read errors are not
+        retried on the same replica; _dispatch moves the request to another
+        replica instead of sleeping through backoff on a dead one.
+        """
+        session = requests.Session()
         
         # Configure retry strategy
         retry_strategy = Retry(
             total=max_retries,
+            connect=0 if failover else None,
+            read=0 if failover else None,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=10)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy, pool_connections=10, pool_maxsize=POOL_MAXSIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """Session of the primary (first) endpoint."""
+        return self.endpoints[0].session
+
+    @session.setter
+    def session(self, value: requests.Session) -> None:
+        self.endpoints[0].session = value
 
-        logger.info(f"Initialized BankingClient with base URL: {self.base_url}")
+    def _select_endpoint(self, exclude: Optional[List[Endpoint]] = None) -> Optional[Endpoint]:
+        """
+        Pick the endpoint for the next request.
+
+        Ejected endpoints are skipped. Once an ejected endpoint's cooldown
+        expires, a background probe decides whether it is re-admitted. If
+        every candidate is ejected, the one closest to recovery is used.
+
+        Args:
+            exclude: Endpoints already tried for this request
+
+        Returns:
+            Selected endpoint, or None if all endpoints were excluded
+        """
+        now = time.monotonic()
+        to_probe = []
+        with self._endpoint_lock:
+            candidates = [ep for ep in self.endpoints if ep not in (exclude or [])]
+            if not candidates:
+                return None
+
+            for ep in candidates:
+                if ep.ejected and ep.ejected_until <= now and not ep.probing:
+                    ep.probing = True
+                    to_probe.append(ep)
+
+            healthy = [ep for ep in candidates if not ep.ejected]
+            if not healthy:
+                chosen = min(candidates, key=lambda ep: ep.ejected_until)
+            elif self.balancing == "ewma":
+                chosen = min(healthy, key=lambda ep: ep.cost(now) * (ep.outstanding + 1))
+            else:
+                chosen = min(healthy, key=lambda ep: ep.outstanding)
+            chosen.outstanding += 1
+
+        for ep in to_probe:
+            threading.Thread(
+                target=self._probe_endpoint, args=(ep,), name="banking-probe", daemon=True
+            ).start()
+        return chosen
+
+    def _release_endpoint(self, endpoint: Endpoint, elapsed: float, ok: bool) -> None:
+        """
+        Record the outcome of a request against an endpoint.
+
+        Failures count as a full timeout in the latency estimate, so a
+        failing replica stops being preferred before it is ejected.
+
+        Args:
+            endpoint: Endpoint the request was sent to
+            elapsed: Seconds the request took
+            ok: Whether the endpoint answered without a transport/5xx error
+        """
+        with self._endpoint_lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+            if ok:
+                endpoint.record_success(elapsed)
+                return
+
+            endpoint.record_latency(max(elapsed, self.timeout))
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.eject_after:
+                endpoint.ejected = True
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                # Re-eject on the first failure after recovery
+                endpoint.consecutive_failures = self.eject_after - 1
+                logger.warning(
+                    f"Ejecting endpoint {endpoint.url} for {self.eject_seconds}s"
+                )
+
+    def _probe_endpoint(self, endpoint: Endpoint) -> bool:
+        """
+        Send a health probe (GET /accounts) and update the endpoint's state.
+
+        Returns:
+            Whether the endpoint answered successfully
+        """
+        with self._endpoint_lock:
+            endpoint.outstanding += 1
+        start = time.monotonic()
+        try:
+            response = endpoint.session.request(
+                method="GET",
+                url=urljoin(endpoint.url, "/accounts"),
+                timeout=self.timeout
+            )
+            healthy = response.status_code < 500
+        except requests.exceptions.RequestException:
+            healthy = False
+        finally:
+            with self._endpoint_lock:
+                endpoint.probing = False
+
+        # A failed probe on an ejected endpoint re-ejects it for another cooldown
+        was_ejected = endpoint.ejected
+        self._release_endpoint(endpoint, time.monotonic() - start, healthy)
+        if was_ejected and healthy:
+            logger.info(f"Endpoint {endpoint.url} passed health check; re-admitting")
+        return healthy
+
+    def check_endpoints(self) -> Dict[str, bool]:
+        """
+        Actively probe every endpoint and update its health.
+
+        Healthy endpoints are re-admitted immediately; failing ones count
+        towards ejection like failed requests.
+
+        Returns:
+            Mapping of endpoint URL to whether it answered successfully
+        """
+        return {
+            endpoint.url: self._probe_endpoint(endpoint) for endpoint in self.endpoints
+        }
+
+    def _health_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.check_endpoints()
+            except Exception:
+                logger.exception("Background health check failed")
 
     def _request(
         self,
@@ -156,6 +896,11 @@ class BankingClient:
     ) -> Dict[str, Any]:
         """
         Make an HTTP request with error handling and logging.
+
+        GET requests that fail at the transport level are retried once on
+        each remaining endpoint. POST requests only fail over when no
+        connection could be made, since otherwise the first replica may
+        already have applied them.
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -171,8 +916,6 @@ class BankingClient:
             AuthenticationError: If authentication fails
             BankingAPIError: For other API errors
         """
-        url = urljoin(self.base_url, endpoint)
-        
         request_headers = {
             "Content-Type": "application/json",
             "Accept": "application/json"
@@ -189,9 +932,159 @@ class BankingClient:
                 )
             request_headers["Authorization"] = f"Bearer {self._token}"
 
+        if method == "GET" and self.hedge_reads:
+            return self._hedged_request(method, endpoint, data, request_headers)
+        return self._dispatch(method, endpoint, data, request_headers)
+
+    def _dispatch(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        request_headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Send a request to the selected endpoint, failing over on transport errors."""
+        tried: List[Endpoint] = []
+        target = self._select_endpoint()
+        while True:
+            tried.append(target)
+            try:
+                return self._send(target, method, endpoint, data, request_headers)
+            except _TransportError as e:
+                retry_safe = method == "GET" or not e.sent
+                target = self._select_endpoint(exclude=tried) if retry_safe else None
+                if target is None:
+                    raise BankingAPIError(str(e)) from e.__cause__
+                logger.warning(f"{e} - failing over to {target.url}")
+
+    def _hedge_delay(self) -> Optional[float]:
+        """
+        Return how long to wait before hedging a read, or None to not hedge.
+
+        The delay is the configured percentile of recent read latencies.
+        Every read earns hedge_budget tokens, up to HEDGE_MAX_TOKENS, and a
+        hedge spends one; hedging is skipped until enough latency samples
+        exist or while fewer than one token is available.
+        """
+        with self._hedge_lock:
+            self._hedge_tokens = min(self._hedge_tokens + self.hedge_budget, HEDGE_MAX_TOKENS)
+            if len(self._read_latencies) < HEDGE_MIN_SAMPLES or self._hedge_tokens < 1:
+                return None
+            samples = sorted(self._read_latencies)
+        return samples[int(self.hedge_percentile * (len(samples) - 1))]
+
+    def _try_submit(self, kind: str, *args: Any) -> Optional[Future]:
+        """
+        Run _dispatch on the 'read' or 'hedge' pool if it has a free worker.
+
+        Returns:
+            Future of the request, or None if the pool is busy or the client
+            is closed
+        """
+        slots = self._pool_slots[kind]
+        if not slots.acquire(blocking=False):
+            return None
+        with self._hedge_lock:
+            if self._closed.is_set():
+                slots.release()
+                return None
+            pool = self._pools.get(kind)
+            if pool is None:
+                pool = self._pools[kind] = ThreadPoolExecutor(
+                    max_workers=self._pool_workers, thread_name_prefix=f"banking-{kind}"
+                )
+
+        def run():
+            try:
+                return self._dispatch(*args)
+            finally:
+                slots.release()
+
+        return pool.submit(run)
+
+    def _hedged_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        request_headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Send a read and, if it is slower than the hedge delay, a duplicate.
+
+        Reads that cannot be hedged, or arrive while the read pool is busy,
+        are sent on the caller's thread. Otherwise the primary runs on the
+        read pool without queueing, and the first successful answer wins. The slower request cannot be
+        cancelled mid-flight; it finishes in the background and only updates
+        endpoint statistics.
+        """
+        args = (method, endpoint, data, request_headers)
+        delay = None if self._closed.is_set() else self._hedge_delay()
+        primary = self._try_submit("read", *args) if delay is not None else None
+        if primary is None:
+            return self._dispatch(*args)
+
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        with self._hedge_lock:
+            if self._hedge_tokens < 1:
+                return primary.result()
+            self._hedge_tokens -= 1
+        hedge = self._try_submit("hedge", *args)
+        if hedge is None:
+            # Hedge pool saturated or client closed; the spent token is returned
+            with self._hedge_lock:
+                self._hedge_tokens += 1
+            return primary.result()
+        with self._hedge_lock:
+            self._hedges += 1
+        logger.debug(f"Hedging {method} {endpoint} after {delay:.3f}s")
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def close(self) -> None:
+        """Release connection pools and background hedging/health-check threads."""
+        with self._hedge_lock:
+            self._closed.set()
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.session.close()
+
+    def _send(
+        self,
+        target: Endpoint,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        request_headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Send one request to a specific endpoint and parse the response.
+
+        Raises:
+            _TransportError: If the endpoint could not be reached in time
+            AuthenticationError: If authentication fails
+            BankingAPIError: For other API errors
+        """
+        url = urljoin(target.url, endpoint)
+        start = time.monotonic()
+        ok = False
+
         try:
             logger.debug(f"Making {method} request to {url}")
-            response = self.session.request(
+            response = target.session.request(
                 method=method,
                 url=url,
                 json=data,
@@ -201,6 +1094,7 @@ class BankingClient:
             
             # Log response for debugging
             logger.debug(f"Response status: {response.status_code}")
+            ok = response.status_code < 500
             
             # Handle authentication errors
             if response.status_code == 401:
@@ -218,19 +1112,29 @@ class BankingClient:
                 logger.warning(f"Non-JSON response: {response.text}")
                 return {"raw_response": response.text}
 
-        except requests.exceptions.Timeout:
-            raise BankingAPIError(f"Request timeout after {self.timeout} seconds")
+        except requests.exceptions.Timeout as e:
+            raise _TransportError(
+                f"Request timeout after {self.timeout} seconds",
+                sent=not _is_connect_failure(e)
+            ) from e
         except requests.exceptions.ConnectionError as e:
-            raise BankingAPIError(
-                f"Connection error: Unable to reach {self.base_url}. "
-                f"Is the server running? {str(e)}"
-            )
+            raise _TransportError(
+                f"Connection error: Unable to reach {target.url}. "
+                f"Is the server running? {str(e)}",
+                sent=not _is_connect_failure(e)
+            ) from e
         except requests.exceptions.HTTPError as e:
             error_msg = f"HTTP error {response.status_code}: {response.text}"
             logger.error(error_msg)
             raise BankingAPIError(error_msg) from e
         except requests.exceptions.RequestException as e:
             raise BankingAPIError(f"Request failed: {str(e)}") from e
+        finally:
+            elapsed = time.monotonic() - start
+            self._release_endpoint(target, elapsed, ok)
+            if ok and method == "GET":
+                with self._hedge_lock:
+                    self._read_latencies.append(elapsed)
 
     def authenticate(
         self,
@@ -351,6 +1255,52 @@ class BankingClient:
         except Exception as e:
             raise TransferError(f"Transfer operation failed: {str(e)}") from e
 
+    def transfer_batch(
+        self,
+        transfers: List[TransferRequest],
+        use_auth: bool = False,
+        net: bool = False
+    ) -> BatchTransferResult:
+        """
+        Submit a batch of transfers, optionally netting them first.
+
+        Args:
+            transfers: Transfer requests to submit, in order
+            use_auth: Whether to use JWT authentication
+            net: Whether to compress the batch with net_transfers() first
+
+        Returns:
+            BatchTransferResult with one response per submitted transfer and,
+            when netting, the audit mapping back to the original items
+
+        Raises:
+            BatchTransferError: If any transfer in the batch fails; its
+                ``result`` holds the responses of the transfers already
+                applied, in order, and the netting audit
+        """
+        result = BatchTransferResult()
+        to_submit = transfers
+        if net:
+            result.netting = net_transfers(transfers)
+            to_submit = result.netting.transfers
+
+        logger.info(f"Submitting batch of {len(to_submit)} transfers")
+        for index, item in enumerate(to_submit):
+            try:
+                result.responses.append(self.transfer(
+                    from_account=item.from_account,
+                    to_account=item.to_account,
+                    amount=item.amount,
+                    use_auth=use_auth
+                ))
+            except BankingAPIError as e:
+                raise BatchTransferError(
+                    f"Batch transfer {index + 1} of {len(to_submit)} failed "
+                    f"after {len(result.responses)} applied: {str(e)}",
+                    result
+                ) from e
+        return result
+
     def validate_account(self, account_id: str) -> Dict[str, Any]:
         """
         Validate if an account exists and is valid.
@@ -418,6 +1368,31 @@ class BankingClient:
             logger.error(f"Failed to list accounts: {str(e)}")
             raise
 
+    def watch_balances(
+        self,
+        account_ids: Iterable[str],
+        callback: Optional[Callable[[BalanceChange], None]] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0
+    ) -> BalanceWatcher:
+        """
+        Subscribe to balance changes for a set of accounts.
+
+        Args:
+            account_ids: Account IDs to watch
+            callback: Called with a BalanceChange for every changed balance
+            min_interval: Polling interval while balances are changing (seconds)
+            max_interval: Polling interval ceiling while nothing changes (seconds)
+
+        Returns:
+            Started BalanceWatcher; call stop() or use it as a context manager
+        """
+        watcher = BalanceWatcher(
+            self, account_ids, callback, min_interval, max_interval
+        )
+        logger.info(f"Watching balances for {len(watcher.account_ids)} accounts")
+        return watcher.start()
+
     def get_transaction_history(self, use_auth: bool = True) -> Dict[str, Any]:
         """
         Get transaction history (requires authentication).
@@ -440,6 +1415,292 @@ class BankingClient:
             raise
 
 
+class SubmissionQueue:
+    """
+    Bounded, backpressured queue feeding transfers to a BankingClient.
+
+    Every submitted transfer counts against the limits from submit() until its
+    response is delivered, so queued and in-flight work together never exceed
+    max_items transfers or max_bytes of JSON payload, however slow the server
+    gets. Producers block (submit), await (submit_async) or get a
+    QueueFullError (block=False) when there is no room.
+
+    Once pending work reaches the high watermark (a fraction of either limit)
+    the queue stops accepting submissions until it drains below the low
+    watermark, so producers resume in bursts instead of thrashing at the limit.
+
+    A transfer stops counting once its response is set on its future, so
+    responses the caller keeps are not bounded by max_items or max_bytes.
+    Consume them as they complete rather than collecting every future.
+
+    Usage:
+        with SubmissionQueue(client, workers=4, max_items=500) as submissions:
+            for request in stream:
+                submissions.submit(request).add_done_callback(handle_result)
+    """
+
+    def __init__(
+        self,
+        client: 'BankingClient',
+        workers: int = 4,
+        max_items: int = 1000,
+        max_bytes: int = 1_000_000,
+        high_watermark: float = 0.8,
+        low_watermark: float = 0.5,
+        use_auth: bool = False
+    ):
+        """
+        Initialize the queue and start its worker threads.
+
+        Args:
+            client: Client used to submit transfers
+            workers: Number of concurrent transfer requests
+            max_items: Maximum transfers queued or in flight
+            max_bytes: Maximum JSON payload bytes queued or in flight
+            high_watermark: Fraction of a limit at which submissions pause
+            low_watermark: Fraction of the limits below which they resume
+            use_auth: Whether transfers use JWT authentication
+        """
+        if workers < 1 or max_items < 1 or max_bytes < 1:
+            raise ValueError("workers, max_items and max_bytes must be positive")
+        if not 0 < low_watermark <= high_watermark <= 1:
+            raise ValueError("watermarks must satisfy 0 < low <= high <= 1")
+
+        self.client = client
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.use_auth = use_auth
+
+        self._pending: deque = deque()
+        self._items = 0
+        self._bytes = 0
+        self._paused = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "blocked_submits": 0,
+            "high_watermark_hits": 0,
+            "peak_items": 0,
+            "peak_bytes": 0,
+        }
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"banking-submit-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> 'SubmissionQueue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue occupancy and backpressure counters.
+
+        Returns:
+            Dictionary with current pending items/bytes, whether submissions
+            are paused, the watermark thresholds and cumulative counters
+        """
+        with self._cond:
+            return {
+                "pending_items": self._items,
+                "pending_bytes": self._bytes,
+                "paused": self._paused,
+                "high_watermark_items": int(self.high_watermark * self.max_items),
+                "high_watermark_bytes": int(self.high_watermark * self.max_bytes),
+                "low_watermark_items": int(self.low_watermark * self.max_items),
+                "low_watermark_bytes": int(self.low_watermark * self.max_bytes),
+                **self._stats,
+            }
+
+    @staticmethod
+    def _size(request: TransferRequest) -> int:
+        return len(json.dumps(request.to_dict()).encode())
+
+    def _try_enqueue(self, request: TransferRequest, size: int) -> Optional[Future]:
+        """Enqueue if there is room; must be called with the condition held."""
+        if self._closed:
+            raise BankingAPIError("Submission queue is closed")
+        # A single oversized payload is still accepted into an empty queue
+        fits = (
+            self._items + 1 <= self.max_items
+            and (self._bytes + size <= self.max_bytes or self._items == 0)
+        )
+        if self._paused or not fits:
+            return None
+
+        future: Future = Future()
+        self._pending.append((request, size, future))
+        self._items += 1
+        self._bytes += size
+        self._stats["submitted"] += 1
+        self._stats["peak_items"] = max(self._stats["peak_items"], self._items)
+        self._stats["peak_bytes"] = max(self._stats["peak_bytes"], self._bytes)
+        if (self._items >= self.high_watermark * self.max_items
+                or self._bytes >= self.high_watermark * self.max_bytes):
+            self._paused = True
+            self._stats["high_watermark_hits"] += 1
+            logger.warning(
+                f"Submission queue above high watermark "
+                f"({self._items} items, {self._bytes} bytes); pausing producers"
+            )
+        self._cond.notify_all()
+        return future
+
+    def submit(
+        self,
+        request: TransferRequest,
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Queue a transfer, waiting for capacity if necessary.
+
+        Args:
+            request: Transfer to submit
+            block: Whether to wait for capacity
+            timeout: Maximum seconds to wait when blocking (None = forever)
+
+        Returns:
+            Future resolving to the TransferResponse
+
+        Raises:
+            QueueFullError: If there is no capacity and block is False or
+                the timeout expires
+            BankingAPIError: If the queue is closed
+        """
+        size = self._size(request)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            blocked = False
+            while True:
+                future = self._try_enqueue(request, size)
+                if future is not None:
+                    return future
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    self._stats["rejected"] += 1
+                    raise QueueFullError(
+                        f"Submission queue full ({self._items} items, {self._bytes} bytes)"
+                    )
+                if not blocked:
+                    blocked = True
+                    self._stats["blocked_submits"] += 1
+                self._cond.wait(remaining)
+
+    async def submit_async(self, request: TransferRequest) -> 'asyncio.Future':
+        """
+        Queue a transfer, awaiting capacity without blocking the event loop.
+
+        Args:
+            request: Transfer to submit
+
+        Returns:
+            asyncio.Future resolving to the TransferResponse
+
+        Raises:
+            BankingAPIError: If the queue is closed
+        """
+        size = self._size(request)
+        loop = asyncio.get_running_loop()
+        blocked = False
+        while True:
+            ready = asyncio.Event()
+            with self._cond:
+                future = self._try_enqueue(request, size)
+                if future is None:
+                    if not blocked:
+                        blocked = True
+                        self._stats["blocked_submits"] += 1
+                    self._async_waiters.append((loop, ready))
+            if future is not None:
+                return asyncio.wrap_future(future, loop=loop)
+            await ready.wait()
+
+    def _release(self, size: int, failed: bool) -> None:
+        """Return capacity and wake producers; must be called with the condition held."""
+        self._items -= 1
+        self._bytes -= size
+        self._stats["failed" if failed else "completed"] += 1
+        if (self._paused
+                and self._items <= self.low_watermark * self.max_items
+                and self._bytes <= self.low_watermark * self.max_bytes):
+            self._paused = False
+            logger.info("Submission queue below low watermark; resuming producers")
+        if not self._paused:
+            self._wake_async_waiters()
+        self._cond.notify_all()
+
+    def _wake_async_waiters(self) -> None:
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                # Event loop already closed
+                pass
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                request, size, future = self._pending.popleft()
+
+            failed = False
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.client.transfer(
+                        from_account=request.from_account,
+                        to_account=request.to_account,
+                        amount=request.amount,
+                        use_auth=self.use_auth
+                    ))
+                except Exception as e:
+                    failed = True
+                    future.set_exception(e)
+            with self._cond:
+                self._release(size, failed)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all submitted transfers have completed.
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._items == 0, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting submissions; queued transfers are still sent.
+
+        Args:
+            wait: Whether to wait for queued transfers to finish
+        """
+        with self._cond:
+            self._closed = True
+            self._wake_async_waiters()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
 def main():
     """
     CLI interface demonstrating the modernized banking client.
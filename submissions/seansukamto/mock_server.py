@@ -0,0 +1,373 @@
+"""
+In-process Mock Banking Server
+
+A lightweight stand-in for the Java core banking API (see Dockerfile), used to
+run integration and performance tests without starting the JAR. It mirrors the
+endpoints and behaviours exercised by demo_curls_no_jq.sh:
+- Scope-based JWT-style tokens (enquiry / transfer claims)
+- Account listing, validation (valid, invalid and non-existent accounts) and balances
+- Transfers with success/failure responses and optional bearer auth
+- Authenticated transaction history
+- Fault injection (errors, latency, dropped connections) for resilience tests
+
+It is built on the standard library only, starts in milliseconds on an
+ephemeral port and serves requests on keep-alive connections from a thread
+per connection.
+"""
+
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACCOUNTS = {f"ACC{1000 + i}": Decimal("1000.00") for i in range(10)}
+CLAIMS = ("enquiry", "transfer")
+
+
+@dataclass
+class Fault:
+    """
+    Data class describing an injected fault.
+
+    Attributes:
+        path: Only requests whose path starts with this prefix are affected
+        method: Only requests with this HTTP method are affected (None = any)
+        status: HTTP status to answer with instead of the real response
+        delay: Seconds to sleep before handling the request
+        drop: Close the connection without sending a response
+        probability: Chance that a matching request is affected
+        remaining: Number of requests still to affect (None = unlimited)
+    """
+    path: str = "/"
+    method: Optional[str] = None
+    status: Optional[int] = None
+    delay: float = 0.0
+    drop: bool = False
+    probability: float = 1.0
+    remaining: Optional[int] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        """Check whether this fault applies to a request."""
+        if self.method and self.method != method:
+            return False
+        return path.startswith(self.path) and self.remaining != 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the owning MockBankingServer."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    server: '_HTTPServer'
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            status, payload = self.server.bank.handle(
+                method, self.path, dict(self.headers), body
+            )
+        except Exception:
+            # Always answer, so a handler bug can't hang the client
+            logger.exception(f"Mock server failed handling {method} {self.path}")
+            status, payload = 500, {"error": "Internal mock server error"}
+        if status is None:
+            # Injected dropped connection
+            self.close_connection = True
+            return
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    bank: 'MockBankingServer'
+
+
+class MockBankingServer:
+    """
+    In-process mock of the core banking API.
+
+    Usage:
+        with MockBankingServer() as server:
+            client = BankingClient(base_url=server.url)
+            server.inject_fault(path="/transfer", status=503, remaining=1)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        accounts: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the mock server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free ephemeral port)
+            accounts: Initial balances by account ID (defaults to ACC1000-ACC1009)
+        """
+        self.host = host
+        self.port = port
+        self.accounts: Dict[str, Decimal] = (
+            {k: Decimal(str(v)) for k, v in accounts.items()}
+            if accounts is not None else dict(DEFAULT_ACCOUNTS)
+        )
+        self.transactions: List[Dict[str, Any]] = []
+        self.tokens: Dict[str, Tuple[str, str]] = {}
+        self.faults: List[Fault] = []
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[_HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> 'MockBankingServer':
+        """Start serving on a background thread."""
+        self._httpd = _HTTPServer((self.host, self.port), _Handler)
+        self._httpd.bank = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-banking-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Mock banking server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'MockBankingServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def inject_fault(self, **kwargs: Any) -> Fault:
+        """
+        Add a fault; keyword arguments are the Fault fields.
+
+        Returns:
+            The registered Fault, which can be passed to remove_fault()
+        """
+        fault = Fault(**kwargs)
+        with self._lock:
+            self.faults.append(fault)
+        return fault
+
+    def remove_fault(self, fault: Fault) -> None:
+        """Remove a previously injected fault."""
+        with self._lock:
+            self.faults = [f for f in self.faults if f is not fault]
+
+    def clear_faults(self) -> None:
+        """Remove all injected faults."""
+        with self._lock:
+            self.faults.clear()
+
+    def _pick_fault(self, method: str, path: str) -> Optional[Fault]:
+        with self._lock:
+            for fault in self.faults:
+                if fault.matches(method, path) and random.random() < fault.probability:
+                    if fault.remaining is not None:
+                        fault.remaining -= 1
+                    return fault
+        return None
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> Tuple[Optional[int], Any]:
+        """
+        Handle one request.
+
+        Returns:
+            Tuple of (HTTP status, JSON payload); status None drops the connection
+        """
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+        with self._lock:
+            self.request_count += 1
+
+        fault = self._pick_fault(method, path)
+        if fault is not None:
+            if fault.delay:
+                time.sleep(fault.delay)
+            if fault.drop:
+                return None, None
+            if fault.status is not None:
+                return fault.status, {"error": f"Injected fault ({fault.status})"}
+
+        try:
+            data = json.loads(body) if body else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return 400, {"error": "Malformed JSON body"}
+        if not isinstance(data, dict):
+            return 400, {"error": "JSON body must be an object"}
+
+        token = None
+        auth = headers.get("Authorization") or headers.get("authorization") or ""
+        if auth.startswith("Bearer "):
+            token = auth[len("Bearer "):]
+
+        if method == "POST" and path == "/authToken":
+            return self._auth_token(parse_qs(parts.query), data)
+        if method == "POST" and path == "/transfer":
+            return self._transfer(data, token, auth)
+        if method == "GET" and path == "/accounts":
+            with self._lock:
+                return 200, [
+                    {"id": account_id, "balance": float(balance)}
+                    for account_id, balance in self.accounts.items()
+                ]
+        if method == "GET" and path.startswith("/accounts/validate/"):
+            account_id = path.rsplit("/", 1)[1]
+            return 200, {"accountId": account_id, "valid": account_id in self.accounts}
+        if method == "GET" and path.startswith("/accounts/balance/"):
+            account_id = path.rsplit("/", 1)[1]
+            with self._lock:
+                if account_id not in self.accounts:
+                    return 404, {"error": f"Account not found: {account_id}"}
+                return 200, {"accountId": account_id, "balance": float(self.accounts[account_id])}
+        if method == "GET" and path == "/transactions/history":
+            if self._claim(token) is None:
+                return 401, {"error": "Valid bearer token required"}
+            with self._lock:
+                return 200, list(self.transactions)
+        return 404, {"error": f"No route for {method} {path}"}
+
+    def _claim(self, token: Optional[str]) -> Optional[str]:
+        """Return the claim granted to a token, or None if it is unknown."""
+        with self._lock:
+            entry = self.tokens.get(token) if token else None
+        return entry[1] if entry else None
+
+    def _auth_token(self, query: Dict[str, List[str]], data: Dict[str, Any]) -> Tuple[int, Any]:
+        claim = (query.get("claim") or ["enquiry"])[0]
+        if claim not in CLAIMS:
+            return 400, {"error": f"Unknown claim: {claim}"}
+        if not data.get("username") or not data.get("password"):
+            return 401, {"error": "username and password are required"}
+
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self.tokens[token] = (data["username"], claim)
+        return 200, {"token": token, "claim": claim}
+
+    def _transfer(self, data: Dict[str, Any], token: Optional[str], auth: str) -> Tuple[int, Any]:
+        # Auth is optional for transfers, but a presented token must be valid
+        if auth:
+            claim = self._claim(token)
+            if claim is None:
+                return 401, {"error": "Invalid bearer token"}
+            if claim != "transfer":
+                return 403, {"error": "Token lacks transfer scope"}
+
+        from_account = data.get("fromAccount")
+        to_account = data.get("toAccount")
+        try:
+            amount = Decimal(str(data.get("amount")))
+        except InvalidOperation:
+            return 400, {"error": "amount must be a number"}
+        if not amount.is_finite():
+            return 400, {"error": "amount must be a finite number"}
+
+        def failed(message: str) -> Tuple[int, Any]:
+            return 200, {
+                "transactionId": None,
+                "status": "FAILED",
+                "message": message,
+                "fromAccount": from_account,
+                "toAccount": to_account,
+                "amount": float(amount)
+            }
+
+        if amount <= 0:
+            return failed("Amount must be greater than 0")
+        if from_account == to_account:
+            return failed("Source and destination accounts must differ")
+
+        with self._lock:
+            if from_account not in self.accounts:
+                return failed(f"Invalid source account: {from_account}")
+            if to_account not in self.accounts:
+                return failed(f"Invalid destination account: {to_account}")
+            if self.accounts[from_account] < amount:
+                return failed("Insufficient funds")
+
+            self.accounts[from_account] -= amount
+            self.accounts[to_account] += amount
+            record = {
+                "transactionId": str(uuid.uuid4()),
+                "status": "SUCCESS",
+                "message": "Transfer completed",
+                "fromAccount": from_account,
+                "toAccount": to_account,
+                "amount": float(amount)
+            }
+            self.transactions.append(record)
+        return 200, record
+
+
+def main():
+    """Run the mock server in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="In-process mock banking server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8123, help="Port to bind (default: 8123)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockBankingServer(host=args.host, port=args.port).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
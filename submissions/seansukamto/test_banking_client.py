@@ -8,11 +8,16 @@ Demonstrates:
 - Input validation testing
 """
 
+import asyncio
 import json
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
 
+import requests
+
 # Add parent directory to path for imports
 sys.path.insert(0, '.')
 
@@ -21,6 +26,12 @@ from banking_client import (
     TransferRequest,
     TransferResponse,
     BankingAPIError,
+    BatchTransferError,
+    BalanceWatcher,
+    HEDGE_MAX_TOKENS,
+    QueueFullError,
+    SubmissionQueue,
+    net_transfers,
     AuthenticationError,
     TransferError
 )
@@ -67,6 +78,20 @@ class TestTransferRequest(unittest.TestCase):
                 amount=100.00
             )
 
+    def test_sub_cent_amount(self):
+        """Test that amounts rounding to zero cents are rejected."""
+        with self.assertRaises(ValueError):
+            TransferRequest(
+                from_account="ACC1000",
+                to_account="ACC1001",
+                amount=0.004
+            )
+
+    def test_to_dict_rounds_half_up(self):
+        """Test that amounts are rounded to cents half-up, not float round()."""
+        self.assertEqual(TransferRequest("ACC1000", "ACC1001", 2.675).to_dict()["amount"], 2.68)
+        self.assertEqual(TransferRequest("ACC1000", "ACC1001", 0.125).to_dict()["amount"], 0.13)
+
     def test_to_dict(self):
         """Test conversion to dictionary."""
         request = TransferRequest(
@@ -102,6 +127,120 @@ class TestTransferResponse(unittest.TestCase):
         self.assertEqual(response.amount, 100.00)
 
 
+class TestNetTransfers(unittest.TestCase):
+    """Test transfer netting and cycle cancellation."""
+
+    def test_opposite_flows_offset(self):
+        """Test that A->B and B->A collapse into one net transfer."""
+        result = net_transfers([
+            TransferRequest("ACC1000", "ACC1001", 100.00),
+            TransferRequest("ACC1001", "ACC1000", 30.00),
+            TransferRequest("ACC1000", "ACC1001", 5.50),
+        ])
+        self.assertEqual(len(result.transfers), 1)
+        netted = result.transfers[0]
+        self.assertEqual(netted.from_account, "ACC1000")
+        self.assertEqual(netted.to_account, "ACC1001")
+        self.assertEqual(netted.amount, 75.50)
+        self.assertEqual(result.sources, [[0, 1, 2]])
+        self.assertEqual(result.cancelled, [])
+
+    def test_cycle_cancelled(self):
+        """Test that a cycle is cancelled by its smallest leg."""
+        result = net_transfers([
+            TransferRequest("ACC1000", "ACC1001", 100.00),
+            TransferRequest("ACC1001", "ACC1002", 100.00),
+            TransferRequest("ACC1002", "ACC1000", 40.00),
+        ])
+        amounts = {
+            (t.from_account, t.to_account): t.amount for t in result.transfers
+        }
+        self.assertEqual(amounts, {
+            ("ACC1000", "ACC1001"): 60.00,
+            ("ACC1001", "ACC1002"): 60.00,
+        })
+        self.assertEqual(result.cancelled, [2])
+        # The cancelled C->A leg is traced to the transfers it reduced
+        self.assertEqual(result.sources, [[0], [1]])
+        self.assertEqual(result.offsets, [[1, 2], [0, 2]])
+
+    def test_full_cancellation(self):
+        """Test that an exactly balanced batch needs no transfers."""
+        result = net_transfers([
+            TransferRequest("ACC1000", "ACC1001", 10.10),
+            TransferRequest("ACC1001", "ACC1000", 10.10),
+        ])
+        self.assertEqual(result.transfers, [])
+        self.assertEqual(result.cancelled, [0, 1])
+
+    def test_offsets_only_list_shared_cycles(self):
+        """Test that offsets only link transfers cancelled in the same cycle."""
+        result = net_transfers([
+            TransferRequest("A", "B", 10.00),
+            TransferRequest("B", "C", 10.00),
+            TransferRequest("C", "A", 3.00),
+            TransferRequest("B", "D", 2.00),
+            TransferRequest("D", "A", 2.00),
+        ])
+        netted = {
+            (t.from_account, t.to_account): (t.amount, offsets)
+            for t, offsets in zip(result.transfers, result.offsets)
+        }
+        self.assertEqual(netted, {
+            ("A", "B"): (5.00, [1, 2, 3, 4]),
+            ("B", "C"): (7.00, [0, 2]),
+        })
+        self.assertEqual(result.cancelled, [2, 3, 4])
+        self.assertEqual(
+            sorted(result.cycles), [([0, 1, 2], 3.00), ([0, 3, 4], 2.00)]
+        )
+
+    def test_half_cent_amounts_match_unnetted(self):
+        """Test that netting moves exactly the amounts direct posting would."""
+        for originals in (
+            [TransferRequest("ACC1000", "ACC1001", 0.125)] * 2,
+            [TransferRequest("ACC1000", "ACC1001", 2.675)],
+            [
+                TransferRequest("ACC1000", "ACC1001", 1.005),
+                TransferRequest("ACC1001", "ACC1000", 0.125),
+            ],
+        ):
+            posted = round(sum(
+                t.to_dict()["amount"] * (1 if t.from_account == "ACC1000" else -1)
+                for t in originals
+            ), 2)
+            result = net_transfers(originals)
+            self.assertEqual(len(result.transfers), 1)
+            self.assertEqual(result.transfers[0].to_dict()["amount"], posted)
+
+    def test_net_effect_preserved(self):
+        """Test that every account ends with the same net position."""
+        originals = [
+            TransferRequest("ACC1000", "ACC1001", 12.34),
+            TransferRequest("ACC1001", "ACC1002", 56.78),
+            TransferRequest("ACC1002", "ACC1003", 9.99),
+            TransferRequest("ACC1003", "ACC1000", 20.00),
+            TransferRequest("ACC1002", "ACC1000", 3.21),
+        ]
+
+        def positions(transfers):
+            totals = {}
+            for t in transfers:
+                totals[t.from_account] = round(totals.get(t.from_account, 0) - t.amount, 2)
+                totals[t.to_account] = round(totals.get(t.to_account, 0) + t.amount, 2)
+            return {k: v for k, v in totals.items() if v != 0}
+
+        result = net_transfers(originals)
+        self.assertEqual(positions(result.transfers), positions(originals))
+        self.assertLess(len(result.transfers), len(originals))
+        audited = sorted(
+            [i for indices in result.sources for i in indices] + result.cancelled
+        )
+        self.assertEqual(audited, list(range(len(originals))))
+        offsets = {i for indices in result.offsets for i in indices}
+        self.assertTrue(set(result.cancelled) <= offsets)
+
+
 class TestBankingClient(unittest.TestCase):
     """Test BankingClient methods."""
 
@@ -208,6 +347,52 @@ class TestBankingClient(unittest.TestCase):
         result = client.validate_account("ACC1000")
         self.assertTrue(result["valid"])
 
+    def test_transfer_batch_netting(self):
+        """Test that a netted batch only posts the netted transfers."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "SUCCESS", "transactionId": "tx-1"}
+        mock_response.raise_for_status = Mock()
+
+        client = BankingClient(base_url="http://localhost:8123")
+        client.session = MagicMock()
+        client.session.request.return_value = mock_response
+
+        result = client.transfer_batch([
+            TransferRequest("ACC1000", "ACC1001", 100.00),
+            TransferRequest("ACC1001", "ACC1000", 40.00),
+        ], net=True)
+
+        self.assertEqual(client.session.request.call_count, 1)
+        self.assertEqual(len(result.responses), 1)
+        self.assertEqual(result.netting.sources, [[0, 1]])
+        payload = client.session.request.call_args.kwargs["json"]
+        self.assertEqual(payload["amount"], 60.00)
+
+    def test_transfer_batch_partial_failure(self):
+        """Test that a failed batch keeps the applied responses and audit."""
+        ok = Mock(status_code=200, raise_for_status=Mock())
+        ok.json.return_value = {"status": "SUCCESS", "transactionId": "tx-1"}
+        failed = Mock(status_code=200, raise_for_status=Mock())
+        failed.json.return_value = {"status": "FAILED", "message": "Insufficient funds"}
+
+        client = BankingClient(base_url="http://localhost:8123")
+        client.session = MagicMock()
+        client.session.request.side_effect = [ok, failed]
+
+        with self.assertRaises(BatchTransferError) as ctx:
+            client.transfer_batch([
+                TransferRequest("ACC1000", "ACC1001", 100.00),
+                TransferRequest("ACC1002", "ACC1003", 40.00),
+                TransferRequest("ACC1004", "ACC1005", 10.00),
+            ], net=True)
+
+        result = ctx.exception.result
+        self.assertEqual([r.transaction_id for r in result.responses], ["tx-1"])
+        self.assertEqual(result.netting.sources, [[0], [1], [2]])
+        self.assertIsInstance(ctx.exception.__cause__, TransferError)
+        self.assertEqual(client.session.request.call_count, 2)
+
     def test_transfer_invalid_input(self):
         """Test transfer with invalid input."""
         client = BankingClient()
@@ -235,5 +420,515 @@ class TestBankingClient(unittest.TestCase):
             client.transfer("ACC1000", "ACC1001", 100.00)
 
 
+
+class TestMultiEndpoint(unittest.TestCase):
+    """Test load balancing and failover across replicas."""
+
+    def _ok_session(self, payload):
+        session = MagicMock()
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = payload
+        response.raise_for_status = Mock()
+        session.request.return_value = response
+        return session
+
+    def _down_session(self):
+        session = MagicMock()
+        session.request.side_effect = requests.exceptions.ConnectionError("refused")
+        return session
+
+    def test_base_url_list(self):
+        """Test that a list or comma-separated string creates one pool per URL."""
+        client = BankingClient(base_url=["http://a:8123", "http://b:8123"])
+        self.assertEqual([ep.url for ep in client.endpoints], ["http://a:8123", "http://b:8123"])
+        self.assertIsNot(client.endpoints[0].session, client.endpoints[1].session)
+        self.assertEqual(client.base_url, "http://a:8123")
+
+        with patch.dict("os.environ", {"BANKING_API_URL": "http://a:1, http://b:2"}):
+            client = BankingClient()
+        self.assertEqual(len(client.endpoints), 2)
+
+    def test_invalid_balancing(self):
+        """Test that unknown strategies are rejected."""
+        with self.assertRaises(ValueError):
+            BankingClient(balancing="random")
+
+    def test_least_outstanding_spreads_load(self):
+        """Test that busy endpoints are avoided."""
+        client = BankingClient(base_url=["http://a:8123", "http://b:8123"])
+        client.endpoints[0].outstanding = 2
+        chosen = client._select_endpoint()
+        self.assertEqual(chosen.url, "http://b:8123")
+        self.assertEqual(chosen.outstanding, 1)
+
+    def test_ewma_prefers_fast_endpoint(self):
+        """Test that latency-weighted selection favours the faster replica."""
+        client = BankingClient(base_url=["http://a:8123", "http://b:8123"], balancing="ewma")
+        client.endpoints[0].record_success(0.5)
+        client.endpoints[1].record_success(0.05)
+        self.assertEqual(client._select_endpoint().url, "http://b:8123")
+
+    def test_get_fails_over(self):
+        """Test that a read is retried on another replica when one is down."""
+        client = BankingClient(base_url=["http://a:8123", "http://b:8123"])
+        client.endpoints[0].session = self._down_session()
+        client.endpoints[1].session = self._ok_session({"valid": True})
+
+        self.assertTrue(client.validate_account("ACC1000")["valid"])
+        self.assertEqual(client.endpoints[0].consecutive_failures, 1)
+        self.assertEqual(client.endpoints[0].outstanding, 0)
+
+    def test_post_not_failed_over(self):
+        """Test that transfers are not replayed on another replica."""
+        client = BankingClient(base_url=["http://a:8123", "http://b:8123"])
+        client.endpoints[0].session = MagicMock()
+        client.endpoints[0].session.request.side_effect = \
+            requests.exceptions.ConnectionError("connection reset mid-response")
+        client.endpoints[1].session = self._ok_session({"status": "SUCCESS"})
+
+        with self.assertRaises(BankingAPIError):
+            client.transfer("ACC1000", "ACC1001", 10.00)
+        client.endpoints[1].session.request.assert_not_called()
+
+    def test_multi_endpoint_sessions_skip_transport_retries(self):
+        """Test that replicas don't retry connect/read errors on themselves."""
+        single = BankingClient(base_url="http://a:8123").session.get_adapter("http://a")
+        multi = BankingClient(base_url=["http://a:8123", "http://b:8123"]).session.get_adapter("http://a")
+        self.assertIsNone(single.max_retries.connect)
+        self.assertEqual(multi.max_retries.connect, 0)
+        self.assertEqual(multi.max_retries.read, 0)
+        self.assertEqual(multi.max_retries.total, 3)
+
+    def test_ejection_and_recovery(self):
+        """Test that a failing replica is ejected and re-admitted after a health check."""
+        client = BankingClient(
+            base_url=["http://a:8123", "http://b:8123"], eject_after=2, eject_seconds=60
+        )
+        client.endpoints[0].session = self._down_session()
+        client.endpoints[1].session = self._ok_session({"accounts": []})
+
+        for _ in range(2):
+            client.list_accounts()
+        self.assertTrue(client.endpoints[0].ejected)
+        client.endpoints[1].outstanding = 5
+        self.assertEqual(client._select_endpoint().url, "http://b:8123")
+
+        client.endpoints[0].session = self._ok_session({"accounts": []})
+        self.assertEqual(client.check_endpoints(), {"http://a:8123": True, "http://b:8123": True})
+        self.assertFalse(client.endpoints[0].ejected)
+        self.assertEqual(client.endpoints[0].consecutive_failures, 0)
+
+    def test_cooldown_expiry_probes_before_readmission(self):
+        """Test that an ejected replica is only re-admitted once a probe succeeds."""
+        client = BankingClient(
+            base_url=["http://a:8123", "http://b:8123"], eject_after=1, eject_seconds=60
+        )
+        client.endpoints[0].session = self._down_session()
+        client.endpoints[1].session = self._ok_session({"accounts": []})
+        client.list_accounts()
+        self.assertTrue(client.endpoints[0].ejected)
+
+        # Cooldown over but the replica is still down: probed, not re-admitted
+        client.endpoints[0].ejected_until = 0.0
+        self.assertEqual(client._select_endpoint().url, "http://b:8123")
+        for _ in range(200):
+            if client.endpoints[0].ejected_until > 0:
+                break
+            threading.Event().wait(0.01)
+        self.assertTrue(client.endpoints[0].ejected)
+        self.assertGreater(client.endpoints[0].ejected_until, 0)
+
+        # Replica recovered: the next probe re-admits it
+        client.endpoints[0].ejected_until = 0.0
+        client.endpoints[0].session = self._ok_session({"accounts": []})
+        client._select_endpoint()
+        for _ in range(200):
+            if not client.endpoints[0].ejected:
+                break
+            threading.Event().wait(0.01)
+        self.assertFalse(client.endpoints[0].ejected)
+
+    def test_background_health_checks(self):
+        """Test that health_check_interval probes replicas without traffic."""
+        session = self._ok_session({"accounts": []})
+        # Patch before construction: the prober starts inside __init__
+        with patch.object(BankingClient, "_create_session", return_value=session):
+            client = BankingClient(base_url=["http://a:8123"], health_check_interval=0.01)
+        try:
+            for _ in range(200):
+                if client.endpoints[0].session.request.called:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            client.close()
+        self.assertTrue(client.endpoints[0].session.request.called)
+
+    def test_failures_penalise_ewma(self):
+        """Test that a failing replica stops being preferred before ejection."""
+        client = BankingClient(
+            base_url=["http://a:8123", "http://b:8123"], balancing="ewma", timeout=5
+        )
+        client.endpoints[0].record_success(0.01)
+        client.endpoints[1].record_success(0.2)
+        client.endpoints[0].session = self._down_session()
+        client.endpoints[1].session = self._ok_session({"valid": True})
+
+        client.validate_account("ACC1000")
+        self.assertFalse(client.endpoints[0].ejected)
+        self.assertGreaterEqual(client.endpoints[0].ewma_latency, 5)
+        self.assertEqual(client._select_endpoint().url, "http://b:8123")
+
+    def test_peak_ewma(self):
+        """Test that latency spikes are adopted at once and decay gradually."""
+        endpoint = BankingClient(base_url="http://a:8123").endpoints[0]
+        endpoint.record_latency(0.1)
+        endpoint.record_latency(1.0)
+        self.assertAlmostEqual(endpoint.ewma_latency, 1.0)
+        endpoint.record_latency(0.1)
+        self.assertGreater(endpoint.ewma_latency, 0.5)
+        self.assertLess(endpoint.ewma_latency, 1.0)
+        # An idle replica's estimate decays so it is tried again eventually
+        self.assertLess(endpoint.cost(time.monotonic() + 60), 0.1)
+
+
+class TestHedgedReads(unittest.TestCase):
+    """Test hedged GET requests."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+        def request(**kwargs):
+            self.calls += 1
+            response = Mock()
+            response.status_code = 200
+            response.raise_for_status = Mock()
+            if self.calls == 1:
+                # First request is stuck until the test releases it
+                self.release.wait(5)
+                response.json.return_value = {"balance": "slow"}
+            else:
+                response.json.return_value = {"balance": "fast"}
+            return response
+
+        self.client = BankingClient(base_url="http://localhost:8123", hedge_reads=True)
+        self.client.session = MagicMock()
+        self.client.session.request.side_effect = request
+        self.client._read_latencies.extend([0.01] * 20)
+        self.client._hedge_tokens = 1.0
+
+    def tearDown(self):
+        self.release.set()
+        self.client.close()
+
+    def test_slow_read_is_hedged(self):
+        """Test that a read slower than p95 is answered by the hedge."""
+        result = self.client.get_account_balance("ACC1000")
+        self.assertEqual(result["balance"], "fast")
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.client._hedges, 1)
+
+    def test_hedge_budget_exhausted(self):
+        """Test that no hedge is sent once the budget is spent."""
+        self.client._hedge_tokens = 0.0
+        threading.Timer(0.1, self.release.set).start()
+        result = self.client.get_account_balance("ACC1000")
+        self.assertEqual(result["balance"], "slow")
+        self.assertEqual(self.calls, 1)
+
+    def test_hedge_budget_is_bounded(self):
+        """Test that a long healthy period cannot bank an unbounded hedge burst."""
+        for _ in range(10000):
+            self.client._hedge_delay()
+        self.assertLessEqual(self.client._hedge_tokens, HEDGE_MAX_TOKENS)
+
+    def test_saturated_hedge_pool_skips_hedge(self):
+        """Test that hedges are dropped, not queued, when the hedge pool is busy."""
+        for _ in range(self.client._pool_workers):
+            self.client._pool_slots["hedge"].acquire()
+        threading.Timer(0.1, self.release.set).start()
+        result = self.client.get_account_balance("ACC1000")
+        self.assertEqual(result["balance"], "slow")
+        self.assertEqual(self.calls, 1)
+        self.assertGreaterEqual(self.client._hedge_tokens, 1.0)
+
+    def test_invalid_hedge_settings(self):
+        """Test that out-of-range hedge settings are rejected up front."""
+        for kwargs in ({"hedge_percentile": 1.5}, {"hedge_percentile": 0},
+                       {"hedge_budget": -0.1}, {"hedge_budget": 2}):
+            with self.assertRaises(ValueError):
+                BankingClient(hedge_reads=True, **kwargs)
+
+    def test_primary_threads_are_reused(self):
+        """Test that healthy reads reuse pool workers instead of new threads."""
+        self.release.set()
+        self.client.get_account_balance("ACC1000")
+        started = threading.active_count()
+        for _ in range(20):
+            self.client.get_account_balance("ACC1000")
+        self.assertLessEqual(threading.active_count(), started + 1)
+        self.assertEqual(self.client._hedges, 0)
+
+    def test_busy_read_pool_runs_on_caller_thread(self):
+        """Test that reads don't queue behind a saturated read pool."""
+        self.release.set()
+        for _ in range(self.client._pool_workers):
+            self.client._pool_slots["read"].acquire()
+        with patch.object(self.client, "_dispatch", wraps=self.client._dispatch) as dispatch:
+            self.client.get_account_balance("ACC1000")
+        self.assertEqual(dispatch.call_count, 1)
+        self.assertNotIn("read", self.client._pools)
+
+    def test_no_hedging_after_close(self):
+        """Test that a closed client doesn't recreate its pools."""
+        self.release.set()
+        self.client.close()
+        self.client.get_account_balance("ACC1000")
+        self.assertEqual(self.client._pools, {})
+
+    def test_writes_never_hedged(self):
+        """Test that transfers are sent exactly once."""
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"status": "SUCCESS"}
+        response.raise_for_status = Mock()
+        self.client.session.request.side_effect = None
+        self.client.session.request.return_value = response
+        self.client.transfer("ACC1000", "ACC1001", 10.00)
+        self.assertEqual(self.client.session.request.call_count, 1)
+        self.assertEqual(self.client._hedges, 0)
+
+
+class TestBalanceWatcher(unittest.TestCase):
+    """Test the adaptive balance poller behind watch_balances()."""
+
+    def setUp(self):
+        self.balances = {"ACC1000": 100.0, "ACC1001": 50.0, "ACC1002": 10.0}
+        self.client = BankingClient(base_url="http://localhost:8123")
+        self.client.list_accounts = Mock(side_effect=lambda: [
+            {"id": account_id, "balance": balance}
+            for account_id, balance in self.balances.items()
+        ])
+        self.client.get_account_balance = Mock(
+            side_effect=lambda account_id: {"balance": self.balances[account_id]}
+        )
+
+    def test_only_changes_delivered(self):
+        """Test that unchanged balances are not delivered again."""
+        received = []
+        watcher = BalanceWatcher(self.client, ["ACC1000", "ACC1001"], callback=received.append)
+
+        first = watcher.poll()
+        self.assertEqual({c.account_id for c in first}, {"ACC1000", "ACC1001"})
+        self.assertEqual(watcher.poll(), [])
+
+        self.balances["ACC1001"] = 75.0
+        self.balances["ACC1002"] = 0.0
+        changes = watcher.poll()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].account_id, "ACC1001")
+        self.assertEqual(changes[0].previous, 50.0)
+        self.assertEqual(changes[0].balance, 75.0)
+        self.assertEqual(len(received), 3)
+
+    def test_polls_are_batched(self):
+        """Test that one listing request covers all watched accounts."""
+        watcher = BalanceWatcher(self.client, list(self.balances))
+        watcher.poll()
+        watcher.poll()
+        self.assertEqual(self.client.list_accounts.call_count, 2)
+        self.client.get_account_balance.assert_not_called()
+
+    def test_per_account_fallback(self):
+        """Test that listings without balances fall back to per-account reads."""
+        self.client.list_accounts = Mock(return_value=[{"id": "ACC1000"}])
+        watcher = BalanceWatcher(self.client, ["ACC1000", "ACC1001"])
+        watcher.poll()
+        watcher.poll()
+        self.assertEqual(self.client.list_accounts.call_count, 1)
+        self.assertEqual(self.client.get_account_balance.call_count, 4)
+
+    def test_unknown_account_does_not_block_others(self):
+        """Test that an unknown watched ID is reported alone, not failing the poll."""
+        def balance(account_id):
+            if account_id not in self.balances:
+                raise BankingAPIError(f"HTTP error 404: Account not found: {account_id}")
+            return {"balance": self.balances[account_id]}
+
+        self.client.get_account_balance = Mock(side_effect=balance)
+        received = []
+        watcher = BalanceWatcher(self.client, ["ACC1000", "ACC9999"], callback=received.append)
+
+        watcher.poll()
+        self.balances["ACC1000"] = 5.0
+        watcher.poll()
+        self.assertEqual([c.balance for c in received], [100.0, 5.0])
+        self.assertIn("ACC9999", watcher.errors)
+        # The listing keeps serving ACC1000; only the unknown ID is fetched alone
+        self.assertEqual(self.client.list_accounts.call_count, 2)
+        self.assertEqual(
+            [c.args[0] for c in self.client.get_account_balance.call_args_list],
+            ["ACC9999", "ACC9999"]
+        )
+
+    def test_interval_adapts_to_change_rate(self):
+        """Test that the interval backs off while idle and resets on change."""
+        watcher = BalanceWatcher(self.client, ["ACC1000"], min_interval=1, max_interval=8)
+        watcher.poll()
+        self.assertEqual(watcher.interval, 1)
+        for expected in (2, 4, 8, 8):
+            watcher.poll()
+            self.assertEqual(watcher.interval, expected)
+        self.balances["ACC1000"] = 1.0
+        watcher.poll()
+        self.assertEqual(watcher.interval, 1)
+
+    def test_async_iteration(self):
+        """Test consuming changes with async for from a running watcher."""
+        watcher = self.client.watch_balances(["ACC1000"], min_interval=0.01)
+
+        async def first_change():
+            async for change in watcher:
+                return change
+
+        try:
+            change = asyncio.run(asyncio.wait_for(first_change(), 5))
+        finally:
+            watcher.stop()
+        self.assertEqual(change.account_id, "ACC1000")
+        self.assertEqual(change.balance, 100.0)
+
+    def test_iteration_replays_snapshot_and_ends_on_stop(self):
+        """Test that late iterators get current balances and finish on stop."""
+        watcher = BalanceWatcher(self.client, ["ACC1000", "ACC1001"])
+        watcher.poll()
+        threading.Timer(0.1, watcher.stop).start()
+        changes = list(watcher)
+        self.assertEqual({c.account_id for c in changes}, {"ACC1000", "ACC1001"})
+
+    def test_unexpected_error_keeps_polling(self):
+        """Test that non-API errors are logged instead of killing the poller."""
+        self.client.list_accounts = Mock(side_effect=[KeyError("shape"), [
+            {"id": "ACC1000", "balance": 1.0}
+        ]])
+        received = []
+        watcher = self.client.watch_balances(
+            ["ACC1000"], callback=received.append, min_interval=0.01, max_interval=0.02
+        )
+        try:
+            for _ in range(200):
+                if received:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual(received[0].balance, 1.0)
+
+
+class TestSubmissionQueue(unittest.TestCase):
+    """Test bounded submission with backpressure."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.client = Mock()
+
+        def transfer(**kwargs):
+            self.release.wait(5)
+            return TransferResponse(status="SUCCESS", amount=kwargs["amount"])
+
+        self.client.transfer.side_effect = transfer
+        self.request = TransferRequest("ACC1000", "ACC1001", 10.00)
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_item_limit(self):
+        """Test that submissions beyond max_items are refused or time out."""
+        submissions = SubmissionQueue(self.client, workers=1, max_items=2, high_watermark=1.0)
+        submissions.submit(self.request)
+        submissions.submit(self.request)
+        with self.assertRaises(QueueFullError):
+            submissions.submit(self.request, block=False)
+        with self.assertRaises(QueueFullError):
+            submissions.submit(self.request, timeout=0.05)
+
+        self.release.set()
+        self.assertTrue(submissions.drain(timeout=5))
+        metrics = submissions.metrics()
+        self.assertEqual(metrics["completed"], 2)
+        self.assertEqual(metrics["rejected"], 2)
+        self.assertEqual(metrics["peak_items"], 2)
+        submissions.close()
+
+    def test_byte_limit(self):
+        """Test that the payload byte budget bounds pending work."""
+        size = len(json.dumps(self.request.to_dict()).encode())
+        submissions = SubmissionQueue(
+            self.client, workers=1, max_items=100, max_bytes=size * 3, high_watermark=1.0
+        )
+        for _ in range(3):
+            submissions.submit(self.request)
+        with self.assertRaises(QueueFullError):
+            submissions.submit(self.request, block=False)
+        self.assertEqual(submissions.metrics()["pending_bytes"], size * 3)
+        self.release.set()
+        submissions.close()
+
+    def test_watermark_hysteresis(self):
+        """Test that producers pause at the high watermark until the low one."""
+        gates = [threading.Event() for _ in range(4)]
+        calls = iter(gates)
+        self.client.transfer.side_effect = lambda **kwargs: next(calls).wait(5)
+        submissions = SubmissionQueue(
+            self.client, workers=4, max_items=5, high_watermark=0.8, low_watermark=0.4
+        )
+        futures = [submissions.submit(self.request) for _ in range(4)]
+        self.assertTrue(submissions.metrics()["paused"])
+        with self.assertRaises(QueueFullError):
+            submissions.submit(self.request, block=False)
+
+        gates[0].set()
+        futures[0].result(timeout=5)
+        self.assertTrue(submissions.metrics()["paused"])
+
+        gates[1].set()
+        futures[1].result(timeout=5)
+        self.assertFalse(submissions.drain(timeout=0))
+        self.assertFalse(submissions.metrics()["paused"])
+        submissions.submit(self.request, block=False)
+        self.assertEqual(submissions.metrics()["high_watermark_hits"], 1)
+
+        for gate in gates[2:]:
+            gate.set()
+        submissions.close()
+
+    def test_async_submit_waits_for_capacity(self):
+        """Test that submit_async awaits room without blocking the loop."""
+        submissions = SubmissionQueue(self.client, workers=1, max_items=1, high_watermark=1.0)
+
+        async def produce():
+            first = await submissions.submit_async(self.request)
+            second = asyncio.ensure_future(submissions.submit_async(self.request))
+            await asyncio.sleep(0.05)
+            self.assertFalse(second.done())
+            self.release.set()
+            response = await first
+            return response, await (await second)
+
+        first, second = asyncio.run(asyncio.wait_for(produce(), 5))
+        self.assertEqual(first.status, "SUCCESS")
+        self.assertEqual(second.status, "SUCCESS")
+        submissions.close()
+
+    def test_failures_delivered_to_future(self):
+        """Test that transfer errors surface on the future, not the worker."""
+        self.client.transfer.side_effect = TransferError("Insufficient funds")
+        with SubmissionQueue(self.client, workers=1) as submissions:
+            future = submissions.submit(self.request)
+        with self.assertRaises(TransferError):
+            future.result()
+        self.assertEqual(submissions.metrics()["failed"], 1)
+
 if __name__ == "__main__":
     unittest.main()
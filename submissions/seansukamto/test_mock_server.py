@@ -0,0 +1,181 @@
+"""
+Integration tests running the banking client against the in-process mock server.
+
+Demonstrates:
+- Real HTTP round trips, connection pooling and JSON handling
+- Scope-based authentication
+- Retry and failover behaviour under injected faults
+"""
+
+import http.client
+import json
+import time
+import unittest
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from banking_client import (
+    BankingClient,
+    TransferRequest,
+    BankingAPIError,
+    AuthenticationError,
+    SubmissionQueue,
+    TransferError
+)
+from mock_server import MockBankingServer
+
+
+class TestMockServerIntegration(unittest.TestCase):
+    """Exercise BankingClient end to end over HTTP."""
+
+    def setUp(self):
+        self.server = MockBankingServer().start()
+        self.client = BankingClient(base_url=self.server.url, timeout=5, max_retries=1)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_accounts(self):
+        """Test listing, validation and balances."""
+        accounts = self.client.list_accounts()
+        self.assertIn({"id": "ACC1000", "balance": 1000.0}, accounts)
+        self.assertTrue(self.client.validate_account("ACC1000")["valid"])
+        self.assertFalse(self.client.validate_account("ACC2000")["valid"])
+        self.assertEqual(self.client.get_account_balance("ACC1001")["balance"], 1000.0)
+        with self.assertRaises(BankingAPIError):
+            self.client.get_account_balance("ACC9999")
+
+    def test_transfer_and_history(self):
+        """Test a transfer moves funds and appears in the history."""
+        result = self.client.transfer("ACC1000", "ACC1001", 50.00)
+        self.assertEqual(result.status, "SUCCESS")
+        self.assertEqual(self.client.get_account_balance("ACC1000")["balance"], 950.0)
+
+        with self.assertRaises(AuthenticationError):
+            self.client.get_transaction_history()
+        self.client.authenticate(claim="enquiry")
+        history = self.client.get_transaction_history()
+        self.assertEqual([t["transactionId"] for t in history], [result.transaction_id])
+
+    def test_invalid_transfer(self):
+        """Test that invalid accounts and overdrafts fail."""
+        with self.assertRaises(TransferError):
+            self.client.transfer("ACC2000", "ACC1001", 50.00)
+        with self.assertRaises(TransferError):
+            self.client.transfer("ACC1000", "ACC1001", 5000.00)
+
+    def test_auth_scopes(self):
+        """Test that transfers with a token need the transfer claim."""
+        self.client.authenticate(username="alice", password="any", claim="enquiry")
+        with self.assertRaises(BankingAPIError):
+            self.client.transfer("ACC1000", "ACC1001", 10.00, use_auth=True)
+
+        self.client.authenticate(username="bob", password="secret", claim="transfer")
+        result = self.client.transfer("ACC1000", "ACC1001", 10.00, use_auth=True)
+        self.assertEqual(result.status, "SUCCESS")
+
+    def test_netted_batch(self):
+        """Test that a netted batch leaves the same balances."""
+        self.client.transfer_batch([
+            TransferRequest("ACC1000", "ACC1001", 100.00),
+            TransferRequest("ACC1001", "ACC1002", 100.00),
+            TransferRequest("ACC1002", "ACC1000", 40.00),
+        ], net=True)
+        self.assertEqual(self.server.request_count, 2)
+        balances = {a["id"]: a["balance"] for a in self.client.list_accounts()}
+        self.assertEqual(balances["ACC1000"], 940.0)
+        self.assertEqual(balances["ACC1001"], 1000.0)
+        self.assertEqual(balances["ACC1002"], 1060.0)
+
+    def test_retry_on_injected_error(self):
+        """Test that a transient 503 is retried transparently."""
+        self.server.inject_fault(path="/accounts", status=503, remaining=1)
+        self.assertTrue(self.client.validate_account("ACC1000")["valid"])
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_failover_on_dropped_connection(self):
+        """Test that reads fail over to a healthy replica."""
+        with MockBankingServer() as replica:
+            client = BankingClient(base_url=[self.server.url, replica.url], max_retries=0)
+            self.server.inject_fault(drop=True)
+            for _ in range(4):
+                self.assertTrue(client.validate_account("ACC1000")["valid"])
+            self.assertEqual(replica.request_count, 4)
+            client.close()
+
+    def test_fast_failover_from_refused_port(self):
+        """Test that a dead replica costs well under a second, for reads and transfers."""
+        client = BankingClient(base_url=["http://127.0.0.1:1", self.server.url])
+        try:
+            start = time.monotonic()
+            self.assertTrue(client.validate_account("ACC1000")["valid"])
+            self.assertLess(time.monotonic() - start, 0.5)
+
+            # Connection refused means the transfer never reached the dead replica
+            start = time.monotonic()
+            self.assertEqual(client.transfer("ACC1000", "ACC1001", 1.00).status, "SUCCESS")
+            self.assertLess(time.monotonic() - start, 0.5)
+        finally:
+            client.close()
+
+    def test_injected_latency(self):
+        """Test that delay faults slow only matching requests."""
+        self.server.inject_fault(path="/accounts/balance", delay=0.2)
+        start = time.monotonic()
+        self.client.validate_account("ACC1000")
+        self.assertLess(time.monotonic() - start, 0.2)
+        start = time.monotonic()
+        self.client.get_account_balance("ACC1000")
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_backpressure_against_slow_server(self):
+        """Test that a fast producer stays within the queue bounds."""
+        self.server.inject_fault(path="/transfer", delay=0.01)
+        with SubmissionQueue(self.client, workers=4, max_items=20) as submissions:
+            futures = [
+                submissions.submit(TransferRequest("ACC1000", "ACC1001", 1.00))
+                for _ in range(100)
+            ]
+        self.assertTrue(all(f.result().status == "SUCCESS" for f in futures))
+        metrics = submissions.metrics()
+        self.assertLessEqual(metrics["peak_items"], 20)
+        self.assertGreater(metrics["blocked_submits"], 0)
+        self.assertEqual(self.client.get_account_balance("ACC1001")["balance"], 1100.0)
+
+    def _raw_post(self, path, body):
+        conn = http.client.HTTPConnection(self.server.host, self.server.port, timeout=5)
+        try:
+            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            conn.close()
+
+    def test_malformed_transfer_bodies(self):
+        """Test that non-numeric amounts and non-object bodies get a 400."""
+        for body in ('{"fromAccount":"ACC1000","toAccount":"ACC1001","amount":"NaN"}',
+                     '{"fromAccount":"ACC1000","toAccount":"ACC1001","amount":"Infinity"}',
+                     '[1, 2, 3]',
+                     '"transfer"'):
+            status, payload = self._raw_post("/transfer", body)
+            self.assertEqual(status, 400, body)
+            self.assertIn("error", payload)
+
+    def test_throughput(self):
+        """Test that the server itself sustains thousands of requests per second."""
+        conn = http.client.HTTPConnection(self.server.host, self.server.port, timeout=5)
+        requests_sent = 2000
+        start = time.monotonic()
+        for _ in range(requests_sent):
+            conn.request("GET", "/accounts/validate/ACC1000")
+            conn.getresponse().read()
+        rate = requests_sent / (time.monotonic() - start)
+        conn.close()
+        self.assertGreaterEqual(rate, 1000, f"only {rate:.0f} req/s")
+
+
+if __name__ == "__main__":
+    unittest.main()